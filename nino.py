@@ -1,18 +1,339 @@
 #!/usr/bin/env python3
 import curses
+import mmap
+import os
 import sys
 import time
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from enum import IntEnum
+from itertools import chain
 
 CTRL_Q = 17  # Ctrl+Q
 CTRL_S = 19  # Ctrl+S
 CTRL_O = 15  # Ctrl+O
 
 
+class Action(IntEnum):
+    # What the main loop should do after process_key
+    NONE = 0
+    QUIT = 1
+    SAVE = 2
+    OPEN = 3
+
+
+FRAME_TIME = 1 / 60  # redraw at most 60 times a second while keys stream in
+
+# Terminal modes curses has no terminfo capability for
+SYNC_BEGIN = b"\x1b[?2026h"  # DEC 2026: hold output until SYNC_END
+SYNC_END = b"\x1b[?2026l"
+ALT_SCREEN_ON = b"\x1b[?1049h"  # keep the user's scrollback intact
+ALT_SCREEN_OFF = b"\x1b[?1049l"
+
+SAVE_BUFFER_SIZE = 1 << 20  # bytes buffered per write when saving
+
+ROPE_LEAF_SIZE = 128  # max chars per rope leaf; smaller pieces are merged eagerly
+
+# Rope leaves hold code points in a mutable array, so typing edits a leaf
+# in place instead of building a new str. Converting to and from str goes
+# through UTF-32 in native byte order, which is a straight memory copy.
+_CODEC = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
+
+
+def _encode(text: str) -> array:
+    chars = array("I")
+    chars.frombytes(text.encode(_CODEC, "surrogatepass"))
+    return chars
+
+
+def _decode(chars: array) -> str:
+    return chars.tobytes().decode(_CODEC, "surrogatepass")
+
+
+class _Leaf:
+    __slots__ = ("chars",)
+
+    depth = 0
+
+    def __init__(self, chars: array):
+        self.chars = chars
+
+    @property
+    def size(self) -> int:
+        return len(self.chars)
+
+
+class _Node:
+    __slots__ = ("left", "right", "size", "depth")
+
+    size: int
+    depth: int
+
+    def __init__(self, left: "_Tree", right: "_Tree"):
+        self.left = left
+        self.right = right
+        self.size = left.size + right.size
+        self.depth = max(left.depth, right.depth) + 1
+
+
+_Tree = _Leaf | _Node
+
+
+def _build(chars: array, start: int, stop: int) -> _Tree:
+    if stop - start <= ROPE_LEAF_SIZE:
+        return _Leaf(chars[start:stop])
+    mid = (start + stop) // 2
+    return _Node(_build(chars, start, mid), _build(chars, mid, stop))
+
+
+def _balance(left: _Tree, right: _Tree) -> _Tree:
+    # AVL rotations for subtrees whose depths differ by at most two
+    if isinstance(left, _Node) and left.depth > right.depth + 1:
+        lr = left.right
+        if isinstance(lr, _Leaf) or left.left.depth >= lr.depth:
+            return _Node(left.left, _Node(lr, right))
+        return _Node(_Node(left.left, lr.left), _Node(lr.right, right))
+    if isinstance(right, _Node) and right.depth > left.depth + 1:
+        rl = right.left
+        if isinstance(rl, _Leaf) or right.right.depth >= rl.depth:
+            return _Node(_Node(left, rl), right.right)
+        return _Node(_Node(left, rl.left), _Node(rl.right, right.right))
+    return _Node(left, right)
+
+
+def _join(left: _Tree, right: _Tree) -> _Tree:
+    if not left.size:
+        return right
+    if not right.size:
+        return left
+    if isinstance(left, _Node) and left.depth > right.depth + 1:
+        return _balance(left.left, _join(left.right, right))
+    if isinstance(right, _Node) and right.depth > left.depth + 1:
+        return _balance(_join(left, right.left), right.right)
+    if (
+        isinstance(left, _Leaf)
+        and isinstance(right, _Leaf)
+        and left.size + right.size <= ROPE_LEAF_SIZE
+    ):
+        left.chars.extend(right.chars)
+        return left
+    return _Node(left, right)
+
+
+def _split(node: _Tree, index: int) -> tuple[_Tree, _Tree]:
+    if isinstance(node, _Leaf):
+        chars = node.chars
+        return _Leaf(chars[:index]), _Leaf(chars[index:])
+    left_size = node.left.size
+    if index < left_size:
+        head, tail = _split(node.left, index)
+        return head, _join(tail, node.right)
+    if index > left_size:
+        head, tail = _split(node.right, index - left_size)
+        return _join(node.left, head), tail
+    return node.left, node.right
+
+
+def _insert(node: _Tree, index: int, text: str) -> _Tree:
+    if isinstance(node, _Leaf):
+        chars = node.chars
+        if len(text) == 1:
+            chars.insert(index, ord(text))
+        else:
+            chars[index:index] = _encode(text)
+        if len(chars) <= ROPE_LEAF_SIZE:
+            return node
+        return _build(chars, 0, len(chars))
+    left, right = node.left, node.right
+    if index <= left.size:
+        left = _insert(left, index, text)
+    else:
+        right = _insert(right, index - left.size, text)
+    return _balance(left, right)
+
+
+def _delete(node: _Tree, start: int, stop: int) -> _Tree:
+    if isinstance(node, _Leaf):
+        del node.chars[start:stop]
+        return node
+    left, right = node.left, node.right
+    left_size = left.size
+    if start < left_size:
+        left = _delete(left, start, min(stop, left_size))
+    if stop > left_size:
+        right = _delete(right, max(0, start - left_size), stop - left_size)
+    return _join(left, right)
+
+
+class Rope:
+    # Text of a single line as a balanced tree of short leaves. Lines up to
+    # ROPE_LEAF_SIZE chars stay one leaf; longer ones only rebuild the leaf
+    # being edited plus the path down to it. version changes on every edit
+    # so renderers can tell whether a cached slice is still good.
+    __slots__ = ("_root", "version")
+
+    def __init__(self, text: str = "") -> None:
+        chars = _encode(text)
+        self._root = _build(chars, 0, len(chars))
+        self.version = 0
+
+    def __len__(self) -> int:
+        return self._root.size
+
+    def __str__(self) -> str:
+        return self[:]
+
+    def __getitem__(self, key: slice) -> str:
+        root = self._root
+        if isinstance(root, _Leaf):
+            return _decode(root.chars[key])
+        start, stop, _ = key.indices(root.size)
+        chunks = array("I")
+        # Iterative walk over only the leaves that overlap [start, stop)
+        stack: list[tuple[_Tree, int]] = [(root, 0)]
+        while stack:
+            node, offset = stack.pop()
+            if offset >= stop or offset + node.size <= start:
+                continue
+            if isinstance(node, _Node):
+                stack.append((node.right, offset + node.left.size))
+                stack.append((node.left, offset))
+            else:
+                chunks.extend(node.chars[max(0, start - offset) : stop - offset])
+        return _decode(chunks)
+
+    def insert(self, index: int, text: str) -> None:
+        self._root = _insert(self._root, index, text)
+        self.version += 1
+
+    def delete(self, start: int, stop: int | None = None) -> None:
+        if stop is None:
+            stop = start + 1
+        self._root = _delete(self._root, start, stop)
+        self.version += 1
+
+    def split(self, index: int) -> "Rope":
+        # Keep text before index, return the rest as a new rope
+        head, tail = _split(self._root, index)
+        self._root = head
+        self.version += 1
+        rest = Rope()
+        rest._root = tail
+        return rest
+
+    def concat(self, other: "Rope") -> None:
+        # Append other in place; other shares nodes with us afterwards and
+        # must not be edited again.
+        self._root = _join(self._root, other._root)
+        self.version += 1
+
+
+def _split_lines(data: bytes | mmap.mmap) -> list[bytes]:
+    # Split raw file contents into lines. Accepts \n and \r\n endings; a
+    # trailing newline doesn't add an empty last line.
+    lines: list[bytes] = []
+    append = lines.append
+    find = data.find
+    end = len(data)
+    pos = 0
+    while pos < end:
+        nl = find(b"\n", pos)
+        if nl < 0:
+            nl = end
+        stop = nl - 1 if nl > pos and data[nl - 1] == 13 else nl
+        append(data[pos:stop])
+        pos = nl + 1
+    return lines or [b""]
+
+
+def read_lines(filename: str) -> list[bytes]:
+    # Split a file into raw lines straight from an mmap, without reading it
+    # into one big string first. Files that report no size (/proc entries,
+    # pipes) or can't be mapped are read the ordinary way instead.
+    with open(filename, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size:
+            try:
+                mm = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass
+            else:
+                with mm:
+                    return _split_lines(mm)
+        return _split_lines(handle.read())
+
+
+class LineBuffer:
+    # The buffer's lines as a gap buffer: lines before the gap in _head, the
+    # ones after it in _tail, reversed. Inserting or deleting at the gap is a
+    # list append/pop; the gap follows edits, which happen at the cursor, so
+    # Enter and line joins don't shift every line below.
+    #
+    # Lines loaded from disk stay raw bytes until first looked up, so only
+    # the lines that get shown or edited are ever decoded.
+    __slots__ = ("_head", "_tail")
+
+    def __init__(self, lines: Iterable[Rope | bytes] = ()) -> None:
+        self._head: list[Rope | bytes] = list(lines)
+        self._tail: list[Rope | bytes] = []
+
+    def __len__(self) -> int:
+        return len(self._head) + len(self._tail)
+
+    def __getitem__(self, index: int) -> Rope:
+        head = self._head
+        if 0 <= index < len(head):
+            line = head[index]
+            if isinstance(line, bytes):
+                line = head[index] = Rope(line.decode("utf-8", "surrogateescape"))
+            return line
+        tail = self._tail
+        pos = len(head) + len(tail) - 1 - index
+        if index < 0 or pos < 0:
+            raise IndexError("line index out of range")
+        line = tail[pos]
+        if isinstance(line, bytes):
+            line = tail[pos] = Rope(line.decode("utf-8", "surrogateescape"))
+        return line
+
+    def __delitem__(self, index: int) -> None:
+        self._move_gap(index + 1)
+        self._head.pop()
+
+    def window(self, start: int, stop: int) -> list[Rope]:
+        # Lines start..stop-1, clipped to the buffer
+        return [self[i] for i in range(start, min(stop, len(self)))]
+
+    def raw(self) -> Iterator[Rope | bytes]:
+        # All lines in order without decoding: a Rope, or the bytes read
+        # from disk for lines nobody has looked at yet
+        return chain(self._head, reversed(self._tail))
+
+    def insert(self, index: int, line: Rope) -> None:
+        self._move_gap(index)
+        self._head.append(line)
+
+    def _move_gap(self, index: int) -> None:
+        head, tail = self._head, self._tail
+        n = len(head)
+        if index < n:
+            moved = head[index:]
+            del head[index:]
+            moved.reverse()
+            tail.extend(moved)
+        elif index > n:
+            if index > n + len(tail):
+                raise IndexError("line index out of range")
+            moved = tail[n - index :]
+            del tail[n - index :]
+            moved.reverse()
+            head.extend(moved)
+
+
 @dataclass
 class Editor:
     filename: str | None = None
-    lines: list[str] = field(default_factory=lambda: [""])
+    lines: LineBuffer = field(default_factory=lambda: LineBuffer([Rope()]))
     cx: int = 0  # cursor x in line (col)
     cy: int = 0  # cursor y in buffer (row)
 
@@ -25,17 +346,27 @@ class Editor:
     status_time: float = field(default_factory=time.time)
     prompt_msg: str = ""
 
-    def set_status(self, msg: str):
+    # Buffer rows changed since the last frame; redraw repaints every row
+    dirty_rows: set[int] = field(default_factory=set)
+    redraw: bool = True
+    _view: tuple[int, int, int, int] = (0, 0, 0, 0)  # rowoff, coloff, h, w drawn
+    _screen_buf: list[str] = field(default_factory=list)  # text rows on screen
+    # Last visible slice per line as (version, text), for the current coloff/w
+    _row_cache: dict[Rope, tuple[int, str]] = field(default_factory=dict)
+    _clock: tuple[int, str] = (-1, "")  # whole second, formatted
+    _status_bar: tuple[tuple, str, str] = ((), "", "")  # inputs, left, right
+
+    def set_status(self, msg: str) -> None:
         self.status_msg = msg
         self.status_time = time.time()
 
-    def set_prompt(self, msg: str):
+    def set_prompt(self, msg: str) -> None:
         self.prompt_msg = msg
 
-    def current_line(self) -> str:
+    def current_line(self) -> Rope:
         return self.lines[self.cy]
 
-    def clamp_cursor(self):
+    def clamp_cursor(self) -> None:
         # Keep cy in bounds
         if self.cy < 0:
             self.cy = 0
@@ -49,7 +380,7 @@ class Editor:
         if self.cx > line_len:
             self.cx = line_len
 
-    def scroll_into_view(self, screen_h: int, screen_w: int):
+    def scroll_into_view(self, screen_h: int, screen_w: int) -> None:
         # Text area excludes last line (status bar)
         text_h = max(1, screen_h - 1)
         text_w = max(1, screen_w)
@@ -66,26 +397,24 @@ class Editor:
         elif self.cx >= self.coloff + text_w:
             self.coloff = self.cx - text_w + 1
 
-    def insert_char(self, ch: str):
-        line = self.lines[self.cy]
-        self.lines[self.cy] = line[:self.cx] + ch + line[self.cx:]
+    def insert_char(self, ch: str) -> None:
+        self.lines[self.cy].insert(self.cx, ch)
+        self.dirty_rows.add(self.cy)
         self.cx += 1
         self.dirty = True
 
-    def insert_newline(self):
-        line = self.lines[self.cy]
-        left = line[:self.cx]
-        right = line[self.cx:]
-        self.lines[self.cy] = left
+    def insert_newline(self) -> None:
+        right = self.lines[self.cy].split(self.cx)
         self.lines.insert(self.cy + 1, right)
+        self.redraw = True  # rows below shift down
         self.cy += 1
         self.cx = 0
         self.dirty = True
 
-    def backspace(self):
+    def backspace(self) -> None:
         if self.cx > 0:
-            line = self.lines[self.cy]
-            self.lines[self.cy] = line[: self.cx - 1] + line[self.cx :]
+            self.lines[self.cy].delete(self.cx - 1)
+            self.dirty_rows.add(self.cy)
             self.cx -= 1
             self.dirty = True
         elif self.cy > 0:
@@ -93,31 +422,34 @@ class Editor:
             prev = self.lines[self.cy - 1]
             cur = self.lines[self.cy]
             new_cx = len(prev)
-            self.lines[self.cy - 1] = prev + cur
+            prev.concat(cur)
             del self.lines[self.cy]
+            self.redraw = True  # rows below shift up
             self.cy -= 1
             self.cx = new_cx
             self.dirty = True
 
-    def delete(self):
+    def delete(self) -> None:
         line = self.lines[self.cy]
         if self.cx < len(line):
-            self.lines[self.cy] = line[: self.cx] + line[self.cx + 1 :]
+            line.delete(self.cx)
+            self.dirty_rows.add(self.cy)
             self.dirty = True
         elif self.cy < len(self.lines) - 1:
             # Join with next line
-            self.lines[self.cy] = line + self.lines[self.cy + 1]
+            line.concat(self.lines[self.cy + 1])
             del self.lines[self.cy + 1]
+            self.redraw = True  # rows below shift up
             self.dirty = True
 
-    def move_left(self):
+    def move_left(self) -> None:
         if self.cx > 0:
             self.cx -= 1
         elif self.cy > 0:
             self.cy -= 1
             self.cx = len(self.lines[self.cy])
 
-    def move_right(self):
+    def move_right(self) -> None:
         line_len = len(self.lines[self.cy])
         if self.cx < line_len:
             self.cx += 1
@@ -125,108 +457,231 @@ class Editor:
             self.cy += 1
             self.cx = 0
 
-    def move_up(self):
+    def move_up(self) -> None:
         if self.cy > 0:
             self.cy -= 1
 
-    def move_down(self):
+    def move_down(self) -> None:
         if self.cy < len(self.lines) - 1:
             self.cy += 1
 
-    def move_home(self):
+    def move_home(self) -> None:
         self.cx = 0
 
-    def move_end(self):
+    def move_end(self) -> None:
         self.cx = len(self.lines[self.cy])
 
-    def load_file(self, filename: str):
-        with open(filename, "r", encoding="utf-8") as handle:
-            contents = handle.read().splitlines()
-        # Ensure empty file remains a single empty line in the buffer.
-        self.lines = contents if contents else [""]
+    def load_file(self, filename: str) -> None:
+        # An empty file still reads as a single empty line
+        self.lines = LineBuffer(read_lines(filename))
         self.filename = filename
         self.cx = 0
         self.cy = 0
         self.rowoff = 0
         self.coloff = 0
         self.dirty = False
+        self.redraw = True
 
-    def save_file(self, filename: str | None = None):
+    def save_file(self, filename: str | None = None) -> None:
         target = filename or self.filename
         if not target:
             raise ValueError("No filename specified")
-        with open(target, "w", encoding="utf-8") as handle:
-            handle.write("\n".join(self.lines))
+        # Stream line by line through a large buffer instead of joining the
+        # whole file into one string first. Lines never decoded go back out
+        # byte for byte.
+        with open(target, "wb", buffering=SAVE_BUFFER_SIZE) as handle:
+            write = handle.write
+            for i, line in enumerate(self.lines.raw()):
+                if i:
+                    write(b"\n")
+                if not isinstance(line, bytes):
+                    line = str(line).encode("utf-8", "surrogateescape")
+                write(line)
         self.filename = target
         self.dirty = False
 
 
-def draw_status(stdscr, ed: Editor, h: int, w: int):
-    if h < 2:
-        return
-    if ed.filename is None:
-        left = " nino  (NO FILE) "
-    elif ed.dirty:
-        left = " nino  (UNSAVED) "
-    else:
-        left = " nino  (SAVED) "
-    right = f"Ln {ed.cy+1}, Col {ed.cx+1}  {time.strftime('%H:%M:%S')}"
-    bar = left[: max(0, w - 1)].ljust(max(0, w - 1))
-    r = right[: max(0, w - 1)]
-    if len(r) < w - 1:
-        bar = bar[: (w - 1 - len(r))] + r
-
-    stdscr.attron(curses.A_REVERSE)
-    stdscr.addstr(h - 2, 0, bar)
-    stdscr.attroff(curses.A_REVERSE)
+def _clear_row(stdscr, row: int, attr: int = 0):
+    # Blank a row with a single clear-to-EOL instead of writing padding;
+    # attr gives the blanks a look, e.g. reverse video for the bars.
+    stdscr.bkgdset(" ", attr)
+    stdscr.move(row, 0)
+    stdscr.clrtoeol()
+    stdscr.bkgdset(" ", 0)
 
 
-def draw_message(stdscr, ed: Editor, h: int, w: int):
+def draw_status(stdscr, ed: Editor, h: int, w: int, now: float):
+    if h < 2:
+        return
+    # The bar only changes with the clock, the cursor, or the file state;
+    # rebuild it when one of those moves instead of every frame.
+    second = int(now)
+    if second != ed._clock[0]:
+        ed._clock = (second, time.strftime("%H:%M:%S", time.localtime(second)))
+    key = (second, ed.filename is None, ed.dirty, ed.cy, ed.cx, w)
+    if key != ed._status_bar[0]:
+        if ed.filename is None:
+            left = " nino  (NO FILE) "
+        elif ed.dirty:
+            left = " nino  (UNSAVED) "
+        else:
+            left = " nino  (SAVED) "
+        right = f"Ln {ed.cy+1}, Col {ed.cx+1}  {ed._clock[1]}"
+        r = right[: max(0, w - 1)]
+        if len(r) >= w - 1:
+            r = ""
+        ed._status_bar = (key, left[: max(0, w - 1)], r)
+    _, left, right = ed._status_bar
+
+    _clear_row(stdscr, h - 2, curses.A_REVERSE)
+    stdscr.addstr(h - 2, 0, left, curses.A_REVERSE)
+    if right:
+        # Right-aligned; overwrites the end of a long left part
+        stdscr.addstr(h - 2, w - 1 - len(right), right, curses.A_REVERSE)
+
+
+def draw_message(stdscr, ed: Editor, h: int, w: int, now: float):
     if h < 2:
         return
     # Show status message for ~5 seconds
-    if time.time() - ed.status_time > 5:
+    if now - ed.status_time > 5:
         return
     msg = ed.status_msg[: max(0, w - 1)]
-    stdscr.addstr(h - 2, 0, msg.ljust(max(0, w - 1)), curses.A_REVERSE)
+    _clear_row(stdscr, h - 2, curses.A_REVERSE)
+    stdscr.addstr(h - 2, 0, msg, curses.A_REVERSE)
 
 
 def draw_prompt(stdscr, ed: Editor, h: int, w: int):
     if h < 1:
         return
     msg = ed.prompt_msg[: max(0, w - 1)]
-    stdscr.addstr(h - 1, 0, msg.ljust(max(0, w - 1)))
+    _clear_row(stdscr, h - 1)
+    stdscr.addstr(h - 1, 0, msg)
     if ed.prompt_msg and w > 1:
         caret_x = min(len(msg), w - 2)
         stdscr.addstr(h - 1, caret_x, "█", curses.A_BOLD | curses.A_REVERSE)
 
 
+def term_write(seq: bytes):
+    # Bypass curses for raw escapes; flush so they stay ordered with the
+    # output curses writes itself.
+    out = sys.stdout.buffer
+    out.write(seq)
+    out.flush()
+
+
+def flush_frame(stdscr):
+    # Queue the window, then push everything to the tty in one update;
+    # terminals that support it present the whole frame at once.
+    stdscr.noutrefresh()
+    term_write(SYNC_BEGIN)
+    curses.doupdate()
+    term_write(SYNC_END)
+
+
+def _plain(text: str) -> bool:
+    # One column per char: no tabs, control chars or wide glyphs
+    return text.isascii() and text.isprintable()
+
+
+def _changed_span(old: str, new: str) -> tuple[int, int]:
+    # Range of new that differs from old. The common tail is only reusable
+    # when the row keeps its length; otherwise everything after the common
+    # head is rewritten.
+    start = len(os.path.commonprefix((old, new)))
+    stop = len(new)
+    if len(old) == stop:
+        while stop > start and old[stop - 1] == new[stop - 1]:
+            stop -= 1
+    return start, stop
+
+
 def refresh_screen(stdscr, ed: Editor):
-    stdscr.erase()
     h, w = stdscr.getmaxyx()
     text_h = max(1, h - 2)
 
-    # Draw buffer lines within viewport
-    for screen_y in range(text_h):
-        file_y = ed.rowoff + screen_y
-        if file_y >= len(ed.lines):
+    # Settle cursor and scroll first so the rows we draw match the view
+    ed.clamp_cursor()
+    ed.scroll_into_view(h, w)
+
+    # Locals for everything the row loop touches
+    lines = ed.lines
+    rowoff = ed.rowoff
+    coloff = ed.coloff
+    vis_w = max(0, w - 1)
+    move = stdscr.move
+    clrtoeol = stdscr.clrtoeol
+    addstr = stdscr.addstr
+
+    # Only repaint rows that changed, unless the view itself moved
+    view = (rowoff, coloff, h, w)
+    row_cache = ed._row_cache
+    if ed.redraw or view != ed._view:
+        if view[2:] != ed._view[2:]:
+            stdscr.erase()  # resized: old contents are stale
+            ed._screen_buf = [""] * text_h
+        if view[1:] != ed._view[1:]:
+            row_cache = {}  # cached slices are for another column or width
+        rows: list[tuple[int, Rope | None]]
+        rows = list(enumerate(lines.window(rowoff, rowoff + text_h)))
+        rows += [(screen_y, None) for screen_y in range(len(rows), text_h)]
+        # Keep only the rows on screen so the cache can't outgrow the view
+        new_cache = ed._row_cache = {}
+    else:
+        bottom = min(rowoff + text_h, len(lines))
+        rows = [
+            (file_y - rowoff, lines[file_y])
+            for file_y in sorted(ed.dirty_rows)
+            if rowoff <= file_y < bottom
+        ]
+        new_cache = row_cache
+    ed.dirty_rows.clear()
+    ed.redraw = False
+    ed._view = view
+
+    # Draw buffer lines within viewport, sending only what differs from
+    # what the terminal already shows
+    screen_buf = ed._screen_buf
+    for screen_y, line in rows:
+        if line is None:
             # Tilde like vim, empty area
-            stdscr.addstr(screen_y, 0, "~")
+            visible = "~"
+        else:
+            version = line.version
+            cached = row_cache.get(line)
+            if cached is not None and cached[0] == version:
+                visible = cached[1]
+            else:
+                # Apply horizontal scroll
+                visible = line[coloff : coloff + vis_w]
+            new_cache[line] = (version, visible)
+
+        old = screen_buf[screen_y]
+        if visible == old:
             continue
-
-        line = ed.lines[file_y]
-        # Apply horizontal scroll
-        visible = line[ed.coloff : ed.coloff + max(0, w - 1)]
-        stdscr.addstr(screen_y, 0, visible)
-
-    # Status bar
-    draw_status(stdscr, ed, h, w)
-    draw_message(stdscr, ed, h, w)
+        if _plain(old) and _plain(visible):
+            start, stop = _changed_span(old, visible)
+            move(screen_y, start)
+            if len(visible) != len(old):
+                clrtoeol()
+            if start < stop:
+                addstr(screen_y, start, visible[start:stop])
+        else:
+            # String indices aren't screen columns here; repaint the row.
+            # Undecodable bytes are lone surrogates, which curses drops, so
+            # show each as "?" to keep the cursor columns lined up.
+            move(screen_y, 0)
+            clrtoeol()
+            addstr(screen_y, 0, visible.encode("utf-8", "replace").decode("utf-8"))
+        screen_buf[screen_y] = visible
+
+    # Status bar; one clock read serves the whole frame
+    now = time.time()
+    draw_status(stdscr, ed, h, w, now)
+    draw_message(stdscr, ed, h, w, now)
     draw_prompt(stdscr, ed, h, w)
 
     # Place cursor on screen
-    ed.clamp_cursor()
-    ed.scroll_into_view(h, w)
     screen_x = ed.cx - ed.coloff
     screen_y = ed.cy - ed.rowoff
     if 0 <= screen_y < text_h and 0 <= screen_x < w:
@@ -234,47 +689,73 @@ def refresh_screen(stdscr, ed: Editor):
     else:
         stdscr.move(0, 0)
 
-    stdscr.refresh()
-
-
-def process_key(stdscr, ed: Editor, ch: int):
-    if ch == CTRL_Q:
-        raise SystemExit
-    if ch == CTRL_S:
-        raise RuntimeError("SAVE")
-    if ch == CTRL_O:
-        raise RuntimeError("OPEN")
-
-    if ch in (curses.KEY_LEFT,):
-        ed.move_left()
-    elif ch in (curses.KEY_RIGHT,):
-        ed.move_right()
-    elif ch in (curses.KEY_UP,):
-        ed.move_up()
-    elif ch in (curses.KEY_DOWN,):
-        ed.move_down()
-    elif ch in (curses.KEY_HOME,):
-        ed.move_home()
-    elif ch in (curses.KEY_END,):
-        ed.move_end()
-    elif ch in (curses.KEY_BACKSPACE, 127, 8):
-        ed.backspace()
-    elif ch == curses.KEY_DC:  # Delete key
-        ed.delete()
-    elif ch in (10, 13):  # Enter
-        ed.insert_newline()
-    elif 32 <= ch <= 126:  # printable ASCII
-        ed.insert_char(chr(ch))
+    flush_frame(stdscr)
+
+
+# One-char strings for ASCII keys, built once instead of chr() per keystroke
+_CHR = list(map(chr, range(128)))
+
+# Keys the main loop acts on itself
+_ACTIONS = {CTRL_Q: Action.QUIT, CTRL_S: Action.SAVE, CTRL_O: Action.OPEN}
+
+# Editing keys: one dict probe per keystroke instead of walking a ladder
+_KEYMAP = {
+    curses.KEY_LEFT: Editor.move_left,
+    curses.KEY_RIGHT: Editor.move_right,
+    curses.KEY_UP: Editor.move_up,
+    curses.KEY_DOWN: Editor.move_down,
+    curses.KEY_HOME: Editor.move_home,
+    curses.KEY_END: Editor.move_end,
+    curses.KEY_BACKSPACE: Editor.backspace,
+    127: Editor.backspace,
+    8: Editor.backspace,
+    curses.KEY_DC: Editor.delete,  # Delete key
+    10: Editor.insert_newline,  # Enter
+    13: Editor.insert_newline,
+}
+
+
+def process_key(stdscr, ed: Editor, ch: int) -> Action:
+    if 32 <= ch <= 126:  # printable ASCII, the common case
+        ed.insert_char(_CHR[ch])
+        return Action.NONE
+    handler = _KEYMAP.get(ch)
+    if handler is not None:
+        handler(ed)
+        return Action.NONE
     # ignore everything else
+    return _ACTIONS.get(ch, Action.NONE)
 
 
 def prompt_input(stdscr, ed: Editor, prompt: str) -> str | None:
     prev_status = ed.status_msg
     ed.set_prompt(prompt)
     buffer: list[str] = []
+    refresh_screen(stdscr, ed)
+    tick = False
     while True:
-        refresh_screen(stdscr, ed)
+        # Typing only changes the prompt row, and the clock ticking only the
+        # status row, so redraw just those
+        h, w = stdscr.getmaxyx()
+        if tick:
+            now = time.time()
+            draw_status(stdscr, ed, h, w, now)
+            draw_message(stdscr, ed, h, w, now)
+        draw_prompt(stdscr, ed, h, w)
+        if w > 1:
+            stdscr.move(h - 1, min(len(ed.prompt_msg), w - 2))
+        flush_frame(stdscr)
+        # Wake at the next whole second to keep the clock going; the main
+        # loop sets its own timeout again once we return
+        wait = 1.0 - time.time() % 1.0
+        stdscr.timeout(max(1, int(wait * 1000) + 1))
         ch = stdscr.getch()
+        tick = ch == -1
+        if tick:
+            continue
+        if ch == curses.KEY_RESIZE:
+            refresh_screen(stdscr, ed)
+            continue
         if ch in (10, 13):
             text = "".join(buffer).strip()
             ed.set_prompt("")
@@ -290,7 +771,7 @@ def prompt_input(stdscr, ed: Editor, prompt: str) -> str | None:
             if buffer:
                 buffer.pop()
         elif 32 <= ch <= 126:
-            buffer.append(chr(ch))
+            buffer.append(_CHR[ch])
         ed.set_prompt(prompt + "".join(buffer))
 
 
@@ -316,14 +797,54 @@ def handle_save(stdscr, ed: Editor) -> bool:
     return False
 
 
+def handle_key(stdscr, ed: Editor, ch: int) -> bool:
+    # Apply one key from the main loop; returns False when nino should exit
+    if ch == curses.KEY_RESIZE:
+        ed.redraw = True
+        return True
+    if ed.quit_confirm:
+        if ch in (ord("y"), ord("Y")):
+            ed.set_prompt("")
+            ed.quit_confirm = False
+            return not handle_save(stdscr, ed)
+        if ch in (ord("n"), ord("N"), CTRL_Q):
+            return False
+        if ch in (ord("c"), ord("C")):
+            ed.set_prompt("")
+            ed.quit_confirm = False
+            return True
+        ed.set_prompt("")
+        ed.quit_confirm = False
+    if ch == CTRL_Q and ed.dirty:
+        ed.quit_confirm = True
+        ed.set_prompt("Save modified buffer?  (Y)es / (N)o / (C)ancel")
+        return True
+    action = process_key(stdscr, ed, ch)
+    # Several keys can be applied between frames, and the Editor methods
+    # expect a cursor inside the line (e.g. after moving up or down)
+    ed.clamp_cursor()
+    match action:
+        case Action.QUIT:
+            return False
+        case Action.SAVE:
+            handle_save(stdscr, ed)
+        case Action.OPEN:
+            name = prompt_input(stdscr, ed, "Open: ")
+            if name:
+                try:
+                    ed.load_file(name)
+                    ed.set_status(f"Opened {name}")
+                except OSError as err:
+                    ed.set_status(f"Open failed: {err}")
+    return True
+
+
 def main(stdscr, initial_filename: str | None = None):
     curses.curs_set(1)
     stdscr.keypad(True)
     curses.noecho()
     curses.cbreak()
 
-    stdscr.timeout(50)  # keep UI responsive
-
     ed = Editor()
     ed.set_status("Ctrl+Q quit | Ctrl+S save | Ctrl+O open | arrows move | type to edit")
     if initial_filename:
@@ -333,48 +854,51 @@ def main(stdscr, initial_filename: str | None = None):
         except OSError as err:
             ed.set_status(f"Open failed: {err}")
 
+    last_draw = 0.0
+    idle = True
     while True:
-        refresh_screen(stdscr, ed)
+        # Always draw when idle; during paste or autorepeat keep to the
+        # frame budget
+        now = time.monotonic()
+        if idle or now - last_draw >= FRAME_TIME:
+            refresh_screen(stdscr, ed)
+            last_draw = now
+            # Nothing pending: sleep until the status clock next ticks
+            wait = 1.0 - time.time() % 1.0
+        else:
+            # A frame was held back: wake when it is due
+            wait = last_draw + FRAME_TIME - now
+        # getch returns as soon as a key arrives, so this only bounds how
+        # long we sleep without input
+        stdscr.timeout(max(1, int(wait * 1000) + 1))
         ch = stdscr.getch()
-        if ch == -1:
+        idle = ch == -1
+        if idle:
             continue
-        if ed.quit_confirm:
-            if ch in (ord("y"), ord("Y")):
-                ed.set_prompt("")
-                ed.quit_confirm = False
-                if handle_save(stdscr, ed):
-                    break
-                continue
-            if ch in (ord("n"), ord("N"), CTRL_Q):
+
+        # Apply this key and whatever is already queued behind it (a paste,
+        # autorepeat) before drawing again, but don't starve the screen
+        # during a long paste.
+        running = handle_key(stdscr, ed, ch)
+        while running and time.monotonic() - last_draw < FRAME_TIME:
+            stdscr.nodelay(True)
+            ch = stdscr.getch()
+            if ch == -1:
                 break
-            if ch in (ord("c"), ord("C")):
-                ed.set_prompt("")
-                ed.quit_confirm = False
-                continue
-            ed.set_prompt("")
-            ed.quit_confirm = False
-        if ch == CTRL_Q and ed.dirty:
-            ed.quit_confirm = True
-            ed.set_prompt("Save modified buffer?  (Y)es / (N)o / (C)ancel")
-            refresh_screen(stdscr, ed)
-            continue
-        try:
-            process_key(stdscr, ed, ch)
-        except RuntimeError as exc:
-            if str(exc) == "SAVE":
-                handle_save(stdscr, ed)
-            elif str(exc) == "OPEN":
-                name = prompt_input(stdscr, ed, "Open: ")
-                if name:
-                    try:
-                        ed.load_file(name)
-                        ed.set_status(f"Opened {name}")
-                    except OSError as err:
-                        ed.set_status(f"Open failed: {err}")
-        except SystemExit:
+            running = handle_key(stdscr, ed, ch)
+        if not running:
             break
 
 
-if __name__ == "__main__":
+def run():
+    # Script entry point; also how a compiled build is started (see README)
     filename_arg = sys.argv[1] if len(sys.argv) > 1 else None
-    curses.wrapper(main, filename_arg)
+    term_write(ALT_SCREEN_ON)
+    try:
+        curses.wrapper(main, filename_arg)
+    finally:
+        term_write(ALT_SCREEN_OFF)
+
+
+if __name__ == "__main__":
+    run()